@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Auto-Claude Backend Worker
+==========================
+Long-lived host for Auto-Claude's run.py, started by the MCP server.
+
+Reads length-prefixed requests on stdin, runs run.py in-process and writes
+length-prefixed replies on stdout. Backend modules stay imported between
+requests, so repeated commands skip interpreter startup and imports.
+The worker exits when stdin is closed.
+
+Wire format (all integers big-endian):
+    request: u32 field count, then for each field (cwd first, then args)
+             a u32 length and that many bytes of UTF-8
+    reply:   i32 return code, u32 stdout length, u32 stderr length,
+             then the raw stdout and stderr bytes
+"""
+
+import io
+import logging
+import os
+import runpy
+import struct
+import sys
+import tempfile
+import traceback
+
+REQUEST_HEADER = struct.Struct(">I")
+REPLY_HEADER = struct.Struct(">iII")
+
+
+def _exit_code(code: object) -> int:
+    """Map a SystemExit code to a process return code."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _flush_std_streams() -> None:
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (AttributeError, OSError, ValueError):
+            pass
+
+
+def run_command(run_py: str, args: list[str], cwd: str) -> tuple[int, bytes, bytes]:
+    """
+    Run run.py once with the given arguments and capture its output.
+
+    Output is captured at the file-descriptor level, so prints, logging
+    handlers and child processes started by run.py are all collected, just
+    as they would be from a fresh process.
+    """
+    returncode = 0
+    root_handlers = logging.root.handlers[:]
+
+    os.chdir(cwd)
+    os.environ["PWD"] = cwd
+    sys.argv = [run_py, *args]
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        saved_fds = os.dup(1), os.dup(2)
+        _flush_std_streams()
+        os.dup2(stdout.fileno(), 1)
+        os.dup2(stderr.fileno(), 2)
+        try:
+            runpy.run_path(run_py, run_name="__main__")
+        except SystemExit as e:
+            returncode = _exit_code(e.code)
+        except Exception:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            _flush_std_streams()
+            for fd, saved in zip((1, 2), saved_fds):
+                os.dup2(saved, fd)
+                os.close(saved)
+            # Drop handlers this request added so the next request's
+            # logging.basicConfig() behaves as it would in a fresh process
+            for handler in logging.root.handlers[:]:
+                if handler not in root_handlers:
+                    logging.root.removeHandler(handler)
+                    handler.close()
+
+        stdout.seek(0)
+        stderr.seek(0)
+        return returncode, stdout.read(), stderr.read()
+
+
+def read_request(stream: io.BufferedReader) -> tuple[str, list[str]] | None:
+    """Read one request frame, or return None once the stream is closed."""
+    header = stream.read(REQUEST_HEADER.size)
+    if len(header) < REQUEST_HEADER.size:
+        return None
+    (count,) = REQUEST_HEADER.unpack(header)
+    fields = []
+    for _ in range(count):
+        (length,) = REQUEST_HEADER.unpack(stream.read(REQUEST_HEADER.size))
+        fields.append(stream.read(length).decode("utf-8"))
+    cwd, *args = fields
+    return cwd, args
+
+
+def serve(backend: str) -> None:
+    """Serve requests from stdin until it is closed."""
+    run_py = os.path.join(backend, "run.py")
+    sys.path.insert(0, backend)
+
+    # Keep private copies of the request/reply pipes. Prompts and any child
+    # processes started by run.py see /dev/null and the per-request capture
+    # files instead, so they can neither consume requests nor corrupt replies.
+    requests = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+
+    while (request := read_request(requests)) is not None:
+        cwd, args = request
+        returncode, stdout, stderr = run_command(run_py, args, cwd)
+        replies.write(REPLY_HEADER.pack(returncode, len(stdout), len(stderr)) + stdout + stderr)
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
@@ -6,16 +6,29 @@ Exposes Auto-Claude functionality via Model Context Protocol.
 """
 
 import asyncio
-import json
+import collections
+import contextlib
+import functools
 import os
+import signal
+import struct
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
+import fastjsonschema
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import LoggingLevel, Tool, TextContent
+
+try:
+    import uvloop  # optional: faster event loop, not available on Windows
+except ImportError:
+    uvloop = None
 
 # Auto-Claude backend path
 AUTO_CLAUDE_BACKEND = Path(os.environ.get(
@@ -23,402 +36,967 @@ AUTO_CLAUDE_BACKEND = Path(os.environ.get(
     "/Users/benjaminwesleythomas/GitProjects/Auto-Claude/apps/backend"
 ))
 
+# Host script for persistent backend workers (see BackendPool)
+WORKER_SCRIPT = Path(__file__).with_name("backend_worker.py")
+
 server = Server("auto-claude-mcp")
 
+# fork/exec and pipe setup run here so they never stall the event loop;
+# workers are only held for the spawn itself, not for the command's lifetime
+_SPAWN_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="auto-claude-spawn")
+
+# Streamed commands keep only this many trailing lines for the final result
+OUTPUT_TAIL_LINES = 2000
+# Streamed output is read in chunks of up to this size
+STREAM_READ_SIZE = 64 * 1024
+# Unterminated output longer than this is forwarded without waiting for a newline
+STREAM_LINE_LIMIT = 1024 * 1024
+
+
+async def _spawn(cmd: list[str] | str, stderr: Any = subprocess.PIPE, **kwargs: Any) -> subprocess.Popen:
+    """
+    Start a subprocess on the spawn pool with stdout (and by default stderr) piped.
+
+    Each child leads its own process group, so _kill also reaches whatever it
+    starts (e.g. run.py and yes behind run_build's shell pipeline).
+    """
+    loop = asyncio.get_running_loop()
+    popen = functools.partial(
+        subprocess.Popen, cmd, stdout=subprocess.PIPE, stderr=stderr, start_new_session=True, **kwargs
+    )
+    return await loop.run_in_executor(_SPAWN_EXECUTOR, popen)
+
+
+async def _kill(proc: subprocess.Popen) -> None:
+    """Kill a spawned process and its process group, and reap it off the event loop."""
+    if proc.poll() is None:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    await asyncio.get_running_loop().run_in_executor(None, proc.wait)
+
+
+async def _communicate(proc: subprocess.Popen, timeout: float) -> tuple[bytes, bytes, int]:
+    """Drain a spawned process's pipes on the event loop and wait for it to exit."""
+    loop = asyncio.get_running_loop()
+    transports = []
+    readers = []
+    for pipe in (proc.stdout, proc.stderr):
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda reader=reader: asyncio.StreamReaderProtocol(reader), pipe)
+        transports.append(transport)
+        readers.append(reader)
+
+    async def collect() -> tuple[bytes, bytes, int]:
+        stdout, stderr = await asyncio.gather(*(reader.read() for reader in readers))
+        # Both pipes hit EOF, so the process has exited or is about to
+        returncode = await loop.run_in_executor(None, proc.wait)
+        return stdout, stderr, returncode
+
+    try:
+        return await asyncio.wait_for(collect(), timeout=timeout)
+    except BaseException:
+        # Timed out or cancelled: closing our pipe ends would otherwise leave
+        # the child running until its next write dies with SIGPIPE
+        await _kill(proc)
+        raise
+    finally:
+        for transport in transports:
+            transport.close()
+
+
+async def _stream(
+    proc: subprocess.Popen,
+    timeout: float,
+    on_output: Callable[[bytes], Awaitable[None]]
+) -> tuple[bytes, int]:
+    """
+    Forward a process's output as it is produced.
+
+    Each pipe read is split at the last newline and everything complete is
+    handed to on_output in one call, so a burst of lines costs one wakeup and
+    one notification rather than one per line. Only the last
+    OUTPUT_TAIL_LINES lines are kept, so memory stays bounded however much a
+    long build prints. Returns that tail and the exit code.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), proc.stdout)
+    tail: collections.deque[bytes] = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    total = 0
+
+    async def emit(batch: bytes) -> None:
+        nonlocal total
+        lines = batch
+        if tail and not tail[-1].endswith(b"\n"):
+            # Finish the line an earlier batch flushed unterminated, but only
+            # up to STREAM_LINE_LIMIT; the rest starts a new entry
+            room = max(STREAM_LINE_LIMIT - len(tail[-1]), 0)
+            head, sep, rest = lines.partition(b"\n")
+            if len(head) <= room:
+                tail[-1] += head + sep
+                lines = rest
+            else:
+                tail[-1] += head[:room]
+                lines = lines[room:]
+        # Split on "\n" only: "\r" progress frames stay part of their line
+        pieces = lines.split(b"\n")
+        last = pieces.pop()
+        lines = [piece + b"\n" for piece in pieces] + ([last] if last else [])
+        # A line that never ends (e.g. "\r" progress) is kept in
+        # STREAM_LINE_LIMIT-sized entries so the tail stays bounded
+        lines = [line[i:i + STREAM_LINE_LIMIT] for line in lines for i in range(0, len(line), STREAM_LINE_LIMIT)]
+        total += len(lines)
+        tail.extend(lines)
+        await on_output(batch)
+
+    async def pump() -> int:
+        pending = b""
+        while chunk := await reader.read(STREAM_READ_SIZE):
+            pending += chunk
+            cut = pending.rfind(b"\n") + 1
+            if not cut and len(pending) >= STREAM_LINE_LIMIT:
+                cut = len(pending)  # Unterminated giant line: flush it as is
+            if cut:
+                batch, pending = pending[:cut], pending[cut:]
+                await emit(batch)
+        if pending:
+            await emit(pending)
+        return await loop.run_in_executor(None, proc.wait)
 
-def run_auto_claude_command(args: list[str], project_dir: str | None = None, auto_accept: bool = False) -> dict[str, Any]:
-    """Run an Auto-Claude CLI command and return the result."""
+    try:
+        returncode = await asyncio.wait_for(pump(), timeout=timeout)
+    except BaseException:
+        # Timed out or cancelled: don't leave the build running orphaned
+        await _kill(proc)
+        raise
+    finally:
+        transport.close()
+
+    output = b"".join(tail)
+    if total > len(tail):
+        output = f"... ({total - len(tail)} earlier lines omitted)\n".encode() + output
+    return output, returncode
+
+
+def _backend_python() -> Path:
+    """Return the Python interpreter used to run the Auto-Claude backend."""
     # Use Auto-Claude's own venv Python, not the MCP server's Python
     auto_claude_python = AUTO_CLAUDE_BACKEND / ".venv" / "bin" / "python"
     if not auto_claude_python.exists():
         auto_claude_python = Path(sys.executable)  # Fallback to system Python
-    cmd = [str(auto_claude_python), str(AUTO_CLAUDE_BACKEND / "run.py")] + args
+    return auto_claude_python
+
+
+# Resolved once (and again if a missing backend is installed later); every
+# command reuses these instead of rebuilding them
+_BACKEND_SCRIPT = AUTO_CLAUDE_BACKEND / "run.py"
+_BACKEND_PYTHON = str(_backend_python())
+_BASE_CMD = (_BACKEND_PYTHON, str(_BACKEND_SCRIPT))
+_BASE_ENV = os.environ.copy()
+# The server never changes directory, so its cwd is fixed
+_SERVER_CWD = os.getcwd()
+
+
+def _project_key(project_dir: str | None) -> str:
+    """Normalize a project_dir so equivalent spellings share workers and cache entries."""
+    return os.path.realpath(project_dir or _SERVER_CWD)
+
+
+# A missing backend is re-checked at most this often (seconds)
+BACKEND_RECHECK_INTERVAL = 30.0
+_backend_ok = _BACKEND_SCRIPT.is_file()
+_backend_checked_at = time.monotonic()
+
+
+def _backend_available() -> bool:
+    """Report whether run.py exists, re-checking a missing one periodically."""
+    global _backend_ok, _backend_checked_at, _BACKEND_PYTHON, _BASE_CMD
+    if not _backend_ok and time.monotonic() - _backend_checked_at >= BACKEND_RECHECK_INTERVAL:
+        _backend_ok = _BACKEND_SCRIPT.is_file()
+        _backend_checked_at = time.monotonic()
+        if _backend_ok:
+            # Startup fell back to our own interpreter; the backend's venv may exist now
+            _BACKEND_PYTHON = str(_backend_python())
+            _BASE_CMD = (_BACKEND_PYTHON, str(_BACKEND_SCRIPT))
+    return _backend_ok
+
+
+class KeyedLocks:
+    """Per-key asyncio locks, created on demand and dropped once unused."""
+
+    def __init__(self) -> None:
+        self._locks: dict[Any, asyncio.Lock] = {}
+        self._users: dict[Any, int] = {}
+
+    def busy(self, key: Any) -> bool:
+        """Whether any task holds or is waiting for the key's lock."""
+        return key in self._users
+
+    @contextlib.asynccontextmanager
+    async def hold(self, key: Any) -> AsyncIterator[None]:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+
+class _Worker:
+    """A backend_worker.py process with its pipes attached to the event loop."""
+
+    # Frame headers, mirroring backend_worker.py
+    REQUEST_HEADER = struct.Struct(">I")
+    REPLY_HEADER = struct.Struct(">iII")
+
+    # How much of a crashed worker's stderr is reported back
+    STDERR_TAIL = 4096
+
+    def __init__(
+        self,
+        proc: subprocess.Popen,
+        reader: asyncio.StreamReader,
+        stdin: asyncio.WriteTransport,
+        stdout: asyncio.ReadTransport,
+        stderr: Any
+    ) -> None:
+        self.proc = proc
+        self._reader = reader
+        self._stdin = stdin
+        self._stdout = stdout
+        self._stderr = stderr
+
+    @classmethod
+    async def start(cls, project_dir: str) -> "_Worker":
+        # Per-request output is captured inside the worker, so only crashes of
+        # the worker itself land here; a file needs no draining
+        stderr = tempfile.TemporaryFile()
+        try:
+            proc = await _spawn(
+                [_BACKEND_PYTHON, str(WORKER_SCRIPT), str(AUTO_CLAUDE_BACKEND)],
+                stderr=stderr,
+                stdin=subprocess.PIPE,
+                cwd=project_dir,
+                env={**_BASE_ENV, "PWD": project_dir}
+            )
+        except BaseException:
+            stderr.close()
+            raise
+        loop = asyncio.get_running_loop()
+        try:
+            reader = asyncio.StreamReader()
+            stdout, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), proc.stdout)
+            stdin, _ = await loop.connect_write_pipe(asyncio.Protocol, proc.stdin)
+        except BaseException:
+            await _kill(proc)
+            stderr.close()
+            raise
+        return cls(proc, reader, stdin, stdout, stderr)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def stderr_tail(self) -> str:
+        """Return the end of what the worker wrote to stderr."""
+        fd = self._stderr.fileno()
+        size = os.fstat(fd).st_size
+        # pread leaves the offset the worker shares with us untouched
+        start = max(0, size - self.STDERR_TAIL)
+        return os.pread(fd, size - start, start).decode(errors="replace")
+
+    async def request(self, args: list[str], project_dir: str) -> tuple[int, bytes, bytes]:
+        """Send one command and wait for its reply."""
+        # Length-prefix every field, so no argument value can split into several
+        fields = [field.encode() for field in (project_dir, *args)]
+        frame = [self.REQUEST_HEADER.pack(len(fields))]
+        for field in fields:
+            frame += [self.REQUEST_HEADER.pack(len(field)), field]
+        # Requests are tiny, so the pipe buffer absorbs them without flow control
+        self._stdin.write(b"".join(frame))
+        header = await self._reader.readexactly(self.REPLY_HEADER.size)
+        returncode, stdout_len, stderr_len = self.REPLY_HEADER.unpack(header)
+        body = await self._reader.readexactly(stdout_len + stderr_len)
+        return returncode, body[:stdout_len], body[stdout_len:]
+
+    async def stop(self, kill: bool = False) -> None:
+        """Shut the worker down; closing stdin asks it to exit on its own."""
+        self._stdin.close()
+        try:
+            if kill:
+                await _kill(self.proc)
+                return
+            wait = asyncio.get_running_loop().run_in_executor(None, self.proc.wait)
+            try:
+                await asyncio.wait_for(wait, timeout=5)
+            except asyncio.TimeoutError:
+                await _kill(self.proc)
+        finally:
+            self._stdout.close()
+            self._stderr.close()
+
+
+class BackendPool:
+    """
+    Persistent backend workers, one per project directory.
+
+    Each worker runs backend_worker.py, which keeps run.py's imports warm and
+    serves length-prefixed binary frames, so read-only commands skip
+    interpreter startup and output stays as bytes end to end. Requests to
+    the same project are serialized by a per-project lock; dead workers are
+    recreated on the next request and idle ones are reaped in the background.
+    """
+
+    # Workers untouched for this long are shut down
+    IDLE_TIMEOUT = 600.0
+    # How often the background reaper looks for idle workers
+    REAP_INTERVAL = 60.0
+
+    def __init__(self) -> None:
+        self._workers: dict[str, _Worker] = {}
+        self._locks = KeyedLocks()
+        self._last_used: dict[str, float] = {}
+        self._reaper: asyncio.Task | None = None
+
+    async def _stop(self, project_dir: str, kill: bool = False) -> None:
+        worker = self._workers.pop(project_dir, None)
+        self._last_used.pop(project_dir, None)
+        if worker is not None:
+            await worker.stop(kill=kill)
+
+    async def _reap_idle(self) -> None:
+        while True:
+            await asyncio.sleep(self.REAP_INTERVAL)
+            cutoff = time.monotonic() - self.IDLE_TIMEOUT
+            for project_dir, last_used in list(self._last_used.items()):
+                if last_used < cutoff and not self._locks.busy(project_dir):
+                    await self._stop(project_dir)
+
+    async def run(self, args: list[str], project_dir: str | None, timeout: float) -> dict[str, Any]:
+        """Run a command on the project's worker, starting it if needed."""
+        project_dir = _project_key(project_dir)
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_idle())
+        async with self._locks.hold(project_dir):
+            try:
+                crash_output = ""
+                for attempt in range(2):
+                    worker = self._workers.get(project_dir)
+                    if worker is None or not worker.alive:
+                        await self._stop(project_dir, kill=True)
+                        worker = self._workers[project_dir] = await _Worker.start(project_dir)
+                    try:
+                        returncode, stdout, stderr = await asyncio.wait_for(
+                            worker.request(args, project_dir), timeout=timeout
+                        )
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        # Worker died mid-request; read-only commands are safe to retry
+                        crash_output = worker.stderr_tail()
+                        await self._stop(project_dir, kill=True)
+                        continue
+                    except BaseException:
+                        # Timed out or cancelled with a reply possibly still in
+                        # flight; reusing the worker would hand that stale reply
+                        # to the next request
+                        await self._stop(project_dir, kill=True)
+                        raise
+                    return {
+                        "success": returncode == 0,
+                        "stdout": stdout,
+                        "stderr": stderr,
+                        "returncode": returncode
+                    }
+                message = "Backend worker exited unexpectedly"
+                if crash_output:
+                    message += f":\n{crash_output}"
+                raise RuntimeError(message)
+            finally:
+                self._last_used[project_dir] = time.monotonic()
+
+    async def close(self) -> None:
+        """Stop the reaper and shut down all workers."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reaper
+            self._reaper = None
+        for project_dir in list(self._workers):
+            await self._stop(project_dir)
+
+
+_BACKEND_POOL = BackendPool()
+
+
+async def run_auto_claude_command(
+    args: list[str],
+    project_dir: str | None = None,
+    auto_accept: bool = False,
+    persistent: bool = False,
+    on_output: Callable[[bytes], Awaitable[None]] | None = None
+) -> dict[str, Any]:
+    """
+    Run an Auto-Claude CLI command and return the result.
+
+    stdout and stderr are returned as raw bytes; callers decode them.
+
+    With persistent=True the command runs on a pooled backend worker instead
+    of a fresh process; use it only for quick, read-only commands.
+
+    With on_output set, stderr is merged into stdout and complete lines are
+    passed to on_output in batches as they arrive; the result then holds only
+    the output tail.
+    """
+    if not _backend_available():
+        return {
+            "success": False,
+            "error": f"Backend not found at {_BACKEND_SCRIPT} (check AUTO_CLAUDE_BACKEND)",
+            "stdout": b"",
+            "stderr": b""
+        }
 
-    env = os.environ.copy()
-    if project_dir:
-        env["PWD"] = project_dir
+    cmd = [*_BASE_CMD, *args]
+    # Without a project_dir the child simply inherits our cwd and environment
+    cwd = project_dir or None
+    env = {**_BASE_ENV, "PWD": project_dir} if project_dir else None
 
     try:
+        if persistent:
+            try:
+                return await _BACKEND_POOL.run(args, project_dir, timeout=300)
+            except asyncio.TimeoutError:
+                return {
+                    "success": False,
+                    "error": "Command timed out",
+                    "stdout": b"",
+                    "stderr": b""
+                }
+
+        stderr_mode = subprocess.STDOUT if on_output else subprocess.PIPE
         if auto_accept:
             # Use printf to send "1\n" repeatedly (continue/accept prompts)
             # Then fall through to empty lines for any remaining prompts
             full_cmd = f'(for i in {{1..20}}; do echo 1; done; yes "") | {" ".join(cmd)}'
-            result = subprocess.run(
-                full_cmd,
-                shell=True,
-                cwd=project_dir or os.getcwd(),
-                capture_output=True,
-                text=True,
-                timeout=1800,  # 30 minute timeout for builds
-                env=env
-            )
+            proc = await _spawn(full_cmd, stderr=stderr_mode, shell=True, cwd=cwd, env=env)
+            timeout = 1800  # 30 minute timeout for builds
         else:
-            result = subprocess.run(
-                cmd,
-                cwd=project_dir or os.getcwd(),
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                env=env
-            )
+            proc = await _spawn(cmd, stderr=stderr_mode, cwd=cwd, env=env)
+            timeout = 300  # 5 minute timeout
+
+        try:
+            if on_output:
+                stdout, returncode = await _stream(proc, timeout, on_output)
+                stderr = b""
+            else:
+                stdout, stderr, returncode = await _communicate(proc, timeout)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": "Command timed out (build may still be running in background)",
+                "stdout": b"",
+                "stderr": b""
+            }
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "returncode": result.returncode
-        }
-    except subprocess.TimeoutExpired:
-        return {
-            "success": False,
-            "error": "Command timed out (build may still be running in background)",
-            "stdout": "",
-            "stderr": ""
+            "success": returncode == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "returncode": returncode
         }
     except Exception as e:
         return {
             "success": False,
             "error": str(e),
-            "stdout": "",
-            "stderr": ""
+            "stdout": b"",
+            "stderr": b""
         }
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available Auto-Claude tools."""
-    return [
-        Tool(
-            name="list_specs",
-            description="List all specs in an Auto-Claude project with their status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path (defaults to current directory)"
-                    }
+# Built once at import; tools/list requests return this same list
+_TOOLS: list[Tool] = [
+    Tool(
+        name="list_specs",
+        description="List all specs in an Auto-Claude project with their status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path (defaults to current directory)"
                 }
             }
-        ),
-        Tool(
-            name="list_worktrees",
-            description="List all spec worktrees and their status (isolated build directories)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    }
+        }
+    ),
+    Tool(
+        name="list_worktrees",
+        description="List all spec worktrees and their status (isolated build directories)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 }
             }
-        ),
-        Tool(
-            name="batch_status",
-            description="Show status of all specs in a project (comprehensive overview)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    }
+        }
+    ),
+    Tool(
+        name="batch_status",
+        description="Show status of all specs in a project (comprehensive overview)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 }
             }
-        ),
-        Tool(
-            name="review_spec",
-            description="Review what an existing build contains (shows diff/changes)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier (e.g., '001' or '001-feature-name')"
-                    }
+        }
+    ),
+    Tool(
+        name="review_spec",
+        description="Review what an existing build contains (shows diff/changes)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="qa_status",
-            description="Show QA validation status for a spec",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    }
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier (e.g., '001' or '001-feature-name')"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="qa_status",
+        description="Show QA validation status for a spec",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="review_status",
-            description="Show human review/approval status for a spec",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    }
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="review_status",
+        description="Show human review/approval status for a spec",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="merge_preview",
-            description="Preview merge conflicts without actually merging (returns JSON)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    },
-                    "base_branch": {
-                        "type": "string",
-                        "description": "Base branch for merge (optional)"
-                    }
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="merge_preview",
+        description="Preview merge conflicts without actually merging (returns JSON)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="merge_worktree",
-            description="Merge a completed build into the main project",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    },
-                    "no_commit": {
-                        "type": "boolean",
-                        "description": "Stage changes but don't commit (review in IDE first)"
-                    },
-                    "base_branch": {
-                        "type": "string",
-                        "description": "Base branch for merge"
-                    }
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="run_build",
-            description="Run a spec build (starts autonomous coding session). WARNING: Long-running operation!",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier (e.g., '001')"
-                    },
-                    "model": {
-                        "type": "string",
-                        "description": "Claude model to use (default: claude-sonnet-4-20250514)"
-                    },
-                    "isolated": {
-                        "type": "boolean",
-                        "description": "Force building in isolated workspace (safer)"
-                    },
-                    "direct": {
-                        "type": "boolean",
-                        "description": "Build directly in project (no isolation)"
-                    },
-                    "skip_qa": {
-                        "type": "boolean",
-                        "description": "Skip automatic QA validation after build"
-                    }
+                "base_branch": {
+                    "type": "string",
+                    "description": "Base branch for merge (optional)"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="merge_worktree",
+        description="Merge a completed build into the main project",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="run_qa",
-            description="Run QA validation loop on a completed build",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    },
-                    "model": {
-                        "type": "string",
-                        "description": "Claude model to use"
-                    }
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="run_followup",
-            description="Add follow-up tasks to a completed spec",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    },
-                    "model": {
-                        "type": "string",
-                        "description": "Claude model to use"
-                    }
+                "no_commit": {
+                    "type": "boolean",
+                    "description": "Stage changes but don't commit (review in IDE first)"
                 },
-                "required": ["spec"]
-            }
-        ),
-        Tool(
-            name="discard_worktree",
-            description="Discard an existing build (deletes worktree). Use with caution!",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_dir": {
-                        "type": "string",
-                        "description": "Project directory path"
-                    },
-                    "spec": {
-                        "type": "string",
-                        "description": "Spec identifier"
-                    }
+                "base_branch": {
+                    "type": "string",
+                    "description": "Base branch for merge"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="run_build",
+        description="Run a spec build (starts autonomous coding session). WARNING: Long-running operation!",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
                 },
-                "required": ["spec"]
-            }
-        )
-    ]
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier (e.g., '001')"
+                },
+                "model": {
+                    "type": "string",
+                    "description": "Claude model to use (default: claude-sonnet-4-20250514)"
+                },
+                "isolated": {
+                    "type": "boolean",
+                    "description": "Force building in isolated workspace (safer)"
+                },
+                "direct": {
+                    "type": "boolean",
+                    "description": "Build directly in project (no isolation)"
+                },
+                "skip_qa": {
+                    "type": "boolean",
+                    "description": "Skip automatic QA validation after build"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="run_qa",
+        description="Run QA validation loop on a completed build",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
+                },
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
+                },
+                "model": {
+                    "type": "string",
+                    "description": "Claude model to use"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="run_followup",
+        description="Add follow-up tasks to a completed spec",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
+                },
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
+                },
+                "model": {
+                    "type": "string",
+                    "description": "Claude model to use"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    Tool(
+        name="discard_worktree",
+        description="Discard an existing build (deletes worktree). Use with caution!",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "project_dir": {
+                    "type": "string",
+                    "description": "Project directory path"
+                },
+                "spec": {
+                    "type": "string",
+                    "description": "Spec identifier"
+                }
+            },
+            "required": ["spec"]
+        }
+    )
+]
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Execute an Auto-Claude tool."""
-    project_dir = arguments.get("project_dir")
-    spec = arguments.get("spec")
+# Compiled once from each tool's inputSchema so bad arguments are rejected
+# before anything is spawned
+_VALIDATORS = {tool.name: fastjsonschema.compile(tool.inputSchema) for tool in _TOOLS}
 
-    if name == "list_specs":
-        result = run_auto_claude_command(["--list"], project_dir)
 
-    elif name == "list_worktrees":
-        result = run_auto_claude_command(["--list-worktrees"], project_dir)
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available Auto-Claude tools."""
+    return _TOOLS
+
+
+def _merge_preview_args(arguments: dict[str, Any]) -> list[str]:
+    args = ["--spec", arguments["spec"], "--merge-preview"]
+    if arguments.get("base_branch"):
+        args.extend(["--base-branch", arguments["base_branch"]])
+    return args
+
+
+def _merge_worktree_args(arguments: dict[str, Any]) -> list[str]:
+    args = ["--spec", arguments["spec"], "--merge"]
+    if arguments.get("no_commit"):
+        args.append("--no-commit")
+    if arguments.get("base_branch"):
+        args.extend(["--base-branch", arguments["base_branch"]])
+    return args
+
+
+def _run_build_args(arguments: dict[str, Any]) -> list[str]:
+    args = ["--spec", arguments["spec"], "--auto-continue", "--force"]
+    if arguments.get("model"):
+        args.extend(["--model", arguments["model"]])
+    if arguments.get("isolated"):
+        args.append("--isolated")
+    if arguments.get("direct"):
+        args.append("--direct")
+    if arguments.get("skip_qa"):
+        args.append("--skip-qa")
+    return args
+
+
+def _model_args(flag: str) -> Callable[[dict[str, Any]], list[str]]:
+    """Build args for a spec command that accepts an optional --model."""
+    def build(arguments: dict[str, Any]) -> list[str]:
+        args = ["--spec", arguments["spec"], flag]
+        if arguments.get("model"):
+            args.extend(["--model", arguments["model"]])
+        return args
+    return build
 
-    elif name == "batch_status":
-        result = run_auto_claude_command(["--batch-status"], project_dir)
 
-    elif name == "review_spec":
-        result = run_auto_claude_command(["--spec", spec, "--review"], project_dir)
+# Tool name -> builder turning tool arguments into run.py CLI args
+_DISPATCH: dict[str, Callable[[dict[str, Any]], list[str]]] = {
+    "list_specs": lambda a: ["--list"],
+    "list_worktrees": lambda a: ["--list-worktrees"],
+    "batch_status": lambda a: ["--batch-status"],
+    "review_spec": lambda a: ["--spec", a["spec"], "--review"],
+    "qa_status": lambda a: ["--spec", a["spec"], "--qa-status"],
+    "review_status": lambda a: ["--spec", a["spec"], "--review-status"],
+    "merge_preview": _merge_preview_args,
+    "merge_worktree": _merge_worktree_args,
+    "run_build": _run_build_args,
+    "run_qa": _model_args("--qa"),
+    "run_followup": _model_args("--followup"),
+    # Force discard - be careful!
+    "discard_worktree": lambda a: ["--spec", a["spec"], "--discard", "--force"],
+}
 
-    elif name == "qa_status":
-        result = run_auto_claude_command(["--spec", spec, "--qa-status"], project_dir)
+# Quick read-only tools served by the persistent backend pool
+_PERSISTENT_TOOLS = frozenset({
+    "list_specs", "list_worktrees", "batch_status",
+    "review_spec", "qa_status", "review_status", "merge_preview",
+})
 
-    elif name == "review_status":
-        result = run_auto_claude_command(["--spec", spec, "--review-status"], project_dir)
+# Tools whose interactive prompts are auto-accepted via piped stdin
+_AUTO_ACCEPT_TOOLS = frozenset({"run_build"})
 
-    elif name == "merge_preview":
-        args = ["--spec", spec, "--merge-preview"]
-        if arguments.get("base_branch"):
-            args.extend(["--base-branch", arguments["base_branch"]])
-        result = run_auto_claude_command(args, project_dir)
+# Long-running tools whose output is forwarded live as log messages
+_STREAMING_TOOLS = frozenset({"run_build", "run_qa", "run_followup"})
 
-    elif name == "merge_worktree":
-        args = ["--spec", spec, "--merge"]
-        if arguments.get("no_commit"):
-            args.append("--no-commit")
-        if arguments.get("base_branch"):
-            args.extend(["--base-branch", arguments["base_branch"]])
-        result = run_auto_claude_command(args, project_dir)
+# MCP log levels, least to most severe; build output is sent at "info"
+_LOG_LEVELS: tuple[LoggingLevel, ...] = ("debug", "info", "notice", "warning", "error", "critical", "alert", "emergency")
+_log_level: LoggingLevel = "info"
 
-    elif name == "run_build":
-        args = ["--spec", spec, "--auto-continue", "--force"]
-        if arguments.get("model"):
-            args.extend(["--model", arguments["model"]])
-        if arguments.get("isolated"):
-            args.append("--isolated")
-        if arguments.get("direct"):
-            args.append("--direct")
-        if arguments.get("skip_qa"):
-            args.append("--skip-qa")
-        # Pipe stdin to auto-accept prompts
-        result = run_auto_claude_command(args, project_dir, auto_accept=True)
-
-    elif name == "run_qa":
-        args = ["--spec", spec, "--qa"]
-        if arguments.get("model"):
-            args.extend(["--model", arguments["model"]])
-        result = run_auto_claude_command(args, project_dir)
 
-    elif name == "run_followup":
-        args = ["--spec", spec, "--followup"]
-        if arguments.get("model"):
-            args.extend(["--model", arguments["model"]])
-        result = run_auto_claude_command(args, project_dir)
+@server.set_logging_level()
+async def set_logging_level(level: LoggingLevel) -> None:
+    """Set the minimum level of log messages sent to the client."""
+    global _log_level
+    _log_level = level
 
-    elif name == "discard_worktree":
-        # Force discard - be careful!
-        result = run_auto_claude_command(["--spec", spec, "--discard", "--force"], project_dir)
 
-    else:
+def _log_enabled(level: LoggingLevel) -> bool:
+    """Whether the client asked for messages at this level."""
+    return _LOG_LEVELS.index(level) >= _LOG_LEVELS.index(_log_level)
+
+
+# Heavy tools (each runs a full Claude session) limited to a few at a time;
+# these are exactly the long-running tools that stream their output
+_THROTTLED_TOOLS = _STREAMING_TOOLS
+
+
+def _max_parallel() -> int:
+    """Read AUTO_CLAUDE_MAX_PARALLEL, falling back to 2 and never below 1."""
+    try:
+        limit = int(os.environ.get("AUTO_CLAUDE_MAX_PARALLEL", "2"))
+    except ValueError:
+        limit = 2
+    return max(1, limit)
+
+
+_BUILD_SEM = asyncio.Semaphore(_max_parallel())
+
+# Status queries that clients poll; successful results are reused briefly.
+# These are the same quick read-only tools the persistent pool serves
+_CACHED_TOOLS = _PERSISTENT_TOOLS
+# Tools that change project state and so invalidate its cached status
+_MUTATING_TOOLS = frozenset({"run_build", "run_qa", "run_followup", "merge_worktree", "discard_worktree"})
+STATUS_TTL = 3.0
+
+# (tool, project, cli args) -> (result, expires_at); expired entries are
+# pruned whenever a new result is stored
+_STATUS_CACHE: dict[tuple, tuple[dict[str, Any], float]] = {}
+_STATUS_LOCKS = KeyedLocks()
+# project -> number of mutations so far, so a query that was already running
+# when a mutation finished knows not to store its now-stale result
+_STATUS_GENERATION: dict[str, int] = {}
+
+
+async def _cached_status(
+    name: str,
+    project_dir: str | None,
+    cli_args: list[str],
+    run: Callable[[], Awaitable[dict[str, Any]]]
+) -> dict[str, Any]:
+    """
+    Return a fresh cached result for the query, or run it and cache it.
+
+    Concurrent callers for the same query share a single backend call.
+    """
+    project = _project_key(project_dir)
+    key = (name, project, tuple(cli_args))
+    entry = _STATUS_CACHE.get(key)
+    if entry and entry[1] > time.monotonic():
+        return entry[0]
+    async with _STATUS_LOCKS.hold(key):
+        # Another waiter may have refreshed the entry while we queued
+        entry = _STATUS_CACHE.get(key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        generation = _STATUS_GENERATION.get(project, 0)
+        result = await run()
+        now = time.monotonic()
+        for stale in [k for k, (_, expires_at) in _STATUS_CACHE.items() if expires_at <= now]:
+            del _STATUS_CACHE[stale]
+        if result.get("success") and _STATUS_GENERATION.get(project, 0) == generation:
+            _STATUS_CACHE[key] = (result, now + STATUS_TTL)
+        return result
+
+
+def _invalidate_status(project_dir: str | None) -> None:
+    """Drop cached status results for a project."""
+    project = _project_key(project_dir)
+    _STATUS_GENERATION[project] = _STATUS_GENERATION.get(project, 0) + 1
+    for key in [key for key in _STATUS_CACHE if key[1] == project]:
+        del _STATUS_CACHE[key]
+
+
+@server.call_tool(validate_input=False)
+async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Execute an Auto-Claude tool."""
+    builder = _DISPATCH.get(name)
+    if builder is None:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
+    try:
+        _VALIDATORS[name](arguments)
+    except fastjsonschema.JsonSchemaException as e:
+        return [TextContent(type="text", text=f"✗ Invalid arguments for {name}: {e.message}")]
+
+    on_output = None
+    if name in _STREAMING_TOOLS:
+        session = server.request_context.session
+
+        async def on_output(lines: bytes) -> None:
+            if not _log_enabled("info"):
+                return
+            # Progress is best effort; a failed notification must not abort the build
+            with contextlib.suppress(Exception):
+                await session.send_log_message(level="info", data=lines.decode(errors="replace").rstrip("\n"), logger=name)
+
+    cli_args = builder(arguments)
+    project_dir = arguments.get("project_dir")
+
+    async def run() -> dict[str, Any]:
+        throttle = _BUILD_SEM if name in _THROTTLED_TOOLS else contextlib.nullcontext()
+        async with throttle:
+            return await run_auto_claude_command(
+                cli_args,
+                project_dir,
+                auto_accept=name in _AUTO_ACCEPT_TOOLS,
+                persistent=name in _PERSISTENT_TOOLS,
+                on_output=on_output
+            )
+
+    if name in _CACHED_TOOLS:
+        result = await _cached_status(name, project_dir, cli_args, run)
+    else:
+        try:
+            result = await run()
+        finally:
+            if name in _MUTATING_TOOLS:
+                _invalidate_status(project_dir)
+
     # Format response
-    output = []
     if result.get("success"):
-        output.append(f"✓ Command succeeded")
+        status = "✓ Command succeeded"
+    elif result.get("error"):
+        status = f"✗ Command failed\nError: {result['error']}"
     else:
-        output.append(f"✗ Command failed")
-        if result.get("error"):
-            output.append(f"Error: {result['error']}")
+        status = "✗ Command failed"
 
+    parts = [status]
     if result.get("stdout"):
-        output.append(f"\n{result['stdout']}")
+        parts.append(result["stdout"].decode(errors="replace"))
     if result.get("stderr"):
-        output.append(f"\nStderr:\n{result['stderr']}")
+        parts.append(f"Stderr:\n{result['stderr'].decode(errors='replace')}")
 
-    return [TextContent(type="text", text="\n".join(output))]
+    return [TextContent(type="text", text="\n\n".join(parts))]
 
 
 async def main():
     """Run the MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await _BACKEND_POOL.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,183 @@
+"""Tests for the persistent backend worker pool."""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+import server
+
+FAKE_RUN_PY = textwrap.dedent("""
+    import logging
+    import os
+    import subprocess
+    import sys
+    import time
+
+    args = sys.argv[1:]
+    if "--slow" in args:
+        open(os.environ["SLOW_MARKER"], "w").close()
+        time.sleep(2)
+    if "--child" in args:
+        subprocess.run(["echo", "child-output"])
+    if "--log" in args:
+        logging.basicConfig(level=logging.INFO, format="LOG %(message)s")
+        logging.info(args[-1])
+    print("ARGS", args)
+""")
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """Point the server at a fake backend whose run.py echoes its args."""
+    (tmp_path / "run.py").write_text(FAKE_RUN_PY)
+    monkeypatch.setattr(server, "AUTO_CLAUDE_BACKEND", tmp_path)
+    monkeypatch.setattr(server, "_BACKEND_PYTHON", sys.executable)
+    monkeypatch.setattr(server, "_BASE_ENV", {**server._BASE_ENV, "SLOW_MARKER": str(tmp_path / "slow")})
+    return tmp_path
+
+
+@pytest.fixture
+def with_pool(backend):
+    """Run a coroutine function against a fresh BackendPool, closing it afterwards."""
+    def run(scenario):
+        async def main():
+            pool = server.BackendPool()
+            try:
+                return await scenario(pool)
+            finally:
+                await pool.close()
+        return asyncio.run(main())
+    return run
+
+
+def test_run_reuses_worker(backend, with_pool):
+    async def scenario(pool):
+        first = await pool.run(["one"], str(backend), timeout=30)
+        worker = pool._workers[server._project_key(str(backend))]
+        second = await pool.run(["two"], str(backend), timeout=30)
+        return first, second, pool._workers[server._project_key(str(backend))] is worker
+
+    first, second, reused = with_pool(scenario)
+    assert first["stdout"] == b"ARGS ['one']\n"
+    assert second["stdout"] == b"ARGS ['two']\n"
+    assert reused
+
+
+def test_cancelled_request_does_not_desync_worker(backend, with_pool):
+    async def scenario(pool):
+        slow = asyncio.create_task(pool.run(["--slow", "first"], str(backend), timeout=30))
+        # Cancel only once the worker is actually running the request
+        while not (backend / "slow").exists():
+            await asyncio.sleep(0.01)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        second = await pool.run(["second"], str(backend), timeout=30)
+        third = await pool.run(["third"], str(backend), timeout=30)
+        return second, third
+
+    second, third = with_pool(scenario)
+    assert second["stdout"] == b"ARGS ['second']\n"
+    assert third["stdout"] == b"ARGS ['third']\n"
+
+
+def test_timed_out_request_does_not_desync_worker(backend, with_pool):
+    async def scenario(pool):
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(["--slow", "first"], str(backend), timeout=0.5)
+        return await pool.run(["second"], str(backend), timeout=30)
+
+    assert with_pool(scenario)["stdout"] == b"ARGS ['second']\n"
+
+
+def test_captures_child_process_output(backend, with_pool):
+    async def scenario(pool):
+        return await pool.run(["--child"], str(backend), timeout=30)
+
+    assert with_pool(scenario)["stdout"] == b"child-output\nARGS ['--child']\n"
+
+
+def test_captures_logging_on_every_request(backend, with_pool):
+    async def scenario(pool):
+        first = await pool.run(["--log", "one"], str(backend), timeout=30)
+        second = await pool.run(["--log", "two"], str(backend), timeout=30)
+        return first, second
+
+    first, second = with_pool(scenario)
+    assert first["stderr"] == b"LOG one\n"
+    assert second["stderr"] == b"LOG two\n"
+
+
+def test_idle_workers_are_reaped_in_background(backend, with_pool, monkeypatch):
+    monkeypatch.setattr(server.BackendPool, "IDLE_TIMEOUT", 0.0)
+    monkeypatch.setattr(server.BackendPool, "REAP_INTERVAL", 0.05)
+
+    async def scenario(pool):
+        await pool.run(["one"], str(backend), timeout=30)
+        worker = pool._workers[server._project_key(str(backend))]
+        await asyncio.sleep(0.5)
+        return worker, dict(pool._workers)
+
+    worker, workers = with_pool(scenario)
+    assert workers == {}
+    assert not worker.alive
+
+
+def test_locks_are_dropped_once_unused(backend, with_pool):
+    async def scenario(pool):
+        await asyncio.gather(*(pool.run([str(i)], str(backend), timeout=30) for i in range(3)))
+        return pool._locks.busy(server._project_key(str(backend))), pool._locks._locks
+
+    busy, locks = with_pool(scenario)
+    assert not busy
+    assert locks == {}
+
+
+def test_dead_worker_is_replaced(backend, with_pool):
+    async def scenario(pool):
+        await pool.run(["one"], str(backend), timeout=30)
+        worker = pool._workers[server._project_key(str(backend))]
+        worker.proc.kill()
+        worker.proc.wait()
+        result = await pool.run(["two"], str(backend), timeout=30)
+        return result, pool._workers[server._project_key(str(backend))] is not worker
+
+    result, replaced = with_pool(scenario)
+    assert result["stdout"] == b"ARGS ['two']\n"
+    assert replaced
+
+
+def test_nul_in_argument_is_not_split(backend, with_pool):
+    args = server._DISPATCH["review_spec"]({"spec": "001\x00--discard\x00--force"})
+
+    async def scenario(pool):
+        return await pool.run(args, str(backend), timeout=30)
+
+    assert with_pool(scenario)["stdout"] == f"ARGS {args!r}\n".encode()
+    assert "--discard" not in args
+
+
+def test_equivalent_project_paths_share_a_worker(backend, with_pool):
+    async def scenario(pool):
+        await pool.run(["one"], str(backend), timeout=30)
+        await pool.run(["two"], f"{backend}/", timeout=30)
+        return list(pool._workers)
+
+    assert with_pool(scenario) == [server._project_key(str(backend))]
+
+
+def test_worker_crash_reports_its_stderr(backend, with_pool, monkeypatch):
+    crashing_worker = backend / "crashing_worker.py"
+    crashing_worker.write_text("import sys\nsys.stdin.buffer.read(1)\nraise ImportError('backend is broken')\n")
+    monkeypatch.setattr(server, "WORKER_SCRIPT", crashing_worker)
+
+    async def scenario(pool):
+        with pytest.raises(RuntimeError) as excinfo:
+            await pool.run(["one"], str(backend), timeout=30)
+        return str(excinfo.value)
+
+    message = with_pool(scenario)
+    assert message.startswith("Backend worker exited unexpectedly:")
+    assert "ImportError: backend is broken" in message
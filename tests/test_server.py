@@ -0,0 +1,211 @@
+"""Tests for the MCP server's tool handling."""
+
+import asyncio
+import time
+
+import pytest
+from mcp import types
+from mcp.server import NotificationOptions
+
+import server
+
+
+def test_logging_capability_is_advertised():
+    capabilities = server.server.get_capabilities(NotificationOptions(), {})
+    assert capabilities.logging is not None
+
+
+def test_log_level_is_respected(monkeypatch):
+    monkeypatch.setattr(server, "_log_level", "info")
+    assert server._log_enabled("info")
+
+    asyncio.run(server.set_logging_level("warning"))
+    assert not server._log_enabled("info")
+    assert server._log_enabled("error")
+
+
+@pytest.mark.parametrize("arguments", [{}, {"spec": 1}])
+def test_invalid_arguments_get_the_tool_error(arguments):
+    handler = server.server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="qa_status", arguments=arguments),
+    )
+    result = asyncio.run(handler(request)).root
+    assert result.content[0].text.startswith("✗ Invalid arguments for qa_status:")
+
+
+def test_max_parallel_parsing(monkeypatch):
+    for value, expected in [("3", 3), ("abc", 2), ("0", 1), ("-4", 1)]:
+        monkeypatch.setenv("AUTO_CLAUDE_MAX_PARALLEL", value)
+        assert server._max_parallel() == expected
+    monkeypatch.delenv("AUTO_CLAUDE_MAX_PARALLEL")
+    assert server._max_parallel() == 2
+
+
+@pytest.fixture
+def status_cache(monkeypatch):
+    """Give each test an empty status cache."""
+    monkeypatch.setattr(server, "_STATUS_CACHE", {})
+    monkeypatch.setattr(server, "_STATUS_LOCKS", server.KeyedLocks())
+    monkeypatch.setattr(server, "_STATUS_GENERATION", {})
+
+
+def _counting_query(calls, result=None):
+    async def run():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return result or {"success": True, "stdout": b"ok"}
+    return run
+
+
+def test_status_queries_are_coalesced_and_cached(status_cache):
+    calls = []
+
+    async def scenario():
+        run = _counting_query(calls)
+        await asyncio.gather(*(server._cached_status("qa_status", "/tmp", ["--qa-status"], run) for _ in range(5)))
+        await server._cached_status("qa_status", "/tmp", ["--qa-status"], run)
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+    assert server._STATUS_LOCKS._locks == {}
+
+
+def test_invalidation_matches_equivalent_project_paths(status_cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "_SERVER_CWD", str(tmp_path))
+    calls = []
+
+    async def scenario():
+        run = _counting_query(calls)
+        await server._cached_status("list_specs", f"{tmp_path}/", ["--list"], run)
+        server._invalidate_status(None)
+        await server._cached_status("list_specs", str(tmp_path), ["--list"], run)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+
+def test_result_started_before_mutation_is_not_stored(status_cache):
+    async def scenario():
+        async def run():
+            # A mutation finishes while this query is still running
+            server._invalidate_status("/tmp")
+            return {"success": True, "stdout": b"stale"}
+
+        await server._cached_status("batch_status", "/tmp", ["--batch-status"], run)
+
+    asyncio.run(scenario())
+    assert server._STATUS_CACHE == {}
+
+
+def test_expired_entries_are_evicted(status_cache, monkeypatch):
+    monkeypatch.setattr(server, "STATUS_TTL", 0.0)
+    calls = []
+
+    async def scenario():
+        run = _counting_query(calls)
+        for spec in ("001", "002", "003"):
+            await server._cached_status("qa_status", "/tmp", ["--spec", spec, "--qa-status"], run)
+
+    asyncio.run(scenario())
+    assert len(server._STATUS_CACHE) == 1
+
+
+def _stream_output(script):
+    async def scenario():
+        proc = await server._spawn(["sh", "-c", script], stderr=server.subprocess.STDOUT)
+        batches = []
+
+        async def on_output(batch):
+            batches.append(batch)
+
+        output, returncode = await server._stream(proc, 30, on_output)
+        return output, returncode, batches
+
+    return asyncio.run(scenario())
+
+
+def test_stream_keeps_carriage_returns_within_a_line():
+    output, returncode, batches = _stream_output(r"printf '\r0%%\r50%%\r99%%\ndone\n'")
+    assert returncode == 0
+    assert output == b"\r0%\r50%\r99%\ndone\n"
+    assert b"".join(batches) == output
+
+
+def test_stream_counts_only_whole_lines_as_omitted(monkeypatch):
+    monkeypatch.setattr(server, "OUTPUT_TAIL_LINES", 2)
+    output, _, _ = _stream_output(r"printf 'a\nb'; sleep 0.2; printf 'c\nd\ne\n'")
+    assert output == b"... (2 earlier lines omitted)\nd\ne\n"
+
+
+def test_stream_tail_stays_bounded_without_newlines(monkeypatch):
+    monkeypatch.setattr(server, "OUTPUT_TAIL_LINES", 5)
+    monkeypatch.setattr(server, "STREAM_LINE_LIMIT", 1000)
+    output, _, batches = _stream_output(
+        f"""{server.sys.executable} -c 'import sys; sys.stdout.write("".join("\\r%05d" % i for i in range(20000)))'"""
+    )
+    assert len(b"".join(batches)) == 120000
+    assert output.startswith(b"... (")
+    assert len(output.partition(b"\n")[2]) == 5 * 1000
+    assert output.endswith(b"\r19999")
+
+
+def test_late_backend_install_uses_its_venv(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "AUTO_CLAUDE_BACKEND", tmp_path)
+    monkeypatch.setattr(server, "_BACKEND_SCRIPT", tmp_path / "run.py")
+    monkeypatch.setattr(server, "_BACKEND_PYTHON", server.sys.executable)
+    monkeypatch.setattr(server, "_BASE_CMD", (server.sys.executable, str(tmp_path / "run.py")))
+    monkeypatch.setattr(server, "_backend_ok", False)
+    monkeypatch.setattr(server, "_backend_checked_at", float("-inf"))
+    assert not server._backend_available()
+
+    venv_python = tmp_path / ".venv" / "bin" / "python"
+    venv_python.parent.mkdir(parents=True)
+    venv_python.symlink_to(server.sys.executable)
+    (tmp_path / "run.py").write_text("")
+    monkeypatch.setattr(server, "_backend_checked_at", float("-inf"))
+
+    assert server._backend_available()
+    assert server._BACKEND_PYTHON == str(venv_python)
+    assert server._BASE_CMD == (str(venv_python), str(tmp_path / "run.py"))
+
+
+def test_cancelled_command_is_killed_and_reaped():
+    async def scenario():
+        proc = await server._spawn(["sleep", "30"])
+        task = asyncio.create_task(server._communicate(proc, 30))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return proc
+
+    proc = asyncio.run(scenario())
+    assert proc.returncode is not None
+
+
+def _pid_running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(") ", 1)[1][0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_timeout_kills_the_whole_shell_pipeline(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    async def scenario():
+        # Like run_build: a shell whose real work happens in its children
+        proc = await server._spawn(f"sleep 30 & echo $! > {pid_file}; wait", shell=True)
+        with pytest.raises(asyncio.TimeoutError):
+            await server._communicate(proc, 0.5)
+
+    asyncio.run(scenario())
+    pid = int(pid_file.read_text())
+    for _ in range(50):
+        if not _pid_running(pid):
+            break
+        time.sleep(0.05)
+    assert not _pid_running(pid)